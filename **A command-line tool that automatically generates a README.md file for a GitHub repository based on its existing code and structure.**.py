@@ -1,115 +1,206 @@
 import os
 import sys
 import argparse
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from heapq import nsmallest
+from itertools import product
+
+# Maps file extensions to the language they are reported as
+_LANGUAGE_MAP = {
+    ".py": "Python",
+    ".js": "JavaScript",
+    ".ts": "TypeScript",
+    ".java": "Java",
+    ".c": "C",
+    ".cpp": "C++",
+    ".cs": "C#",
+    ".go": "Go",
+    ".rb": "Ruby",
+    ".php": "PHP",
+    ".html": "HTML",
+    ".css": "CSS",
+    ".sh": "Shell Script",
+    ".md": "Markdown",
+    ".json": "JSON",
+    ".yaml": "YAML",
+    ".yml": "YAML",
+    ".xml": "XML",
+    ".sql": "SQL",
+    ".txt": "Text",
+}
+
+# Language names become the Counter keys in analyze_directory; interning them makes
+# every lookup an identity match, even if the map is ever built from non-literal strings
+_LANGUAGE_MAP = {extension: sys.intern(language) for extension, language in _LANGUAGE_MAP.items()}
+
+def _case_variants(extension):
+    """Yields every upper/lower-case spelling of an extension (".py", ".pY", ".Py", ".PY")."""
+    return (''.join(chars) for chars in product(*({c.lower(), c.upper()} for c in extension)))
+
+# _LANGUAGE_MAP keyed by every spelling of each extension, so the scan loop needs no str.lower()
+_LANGUAGE_MAP_ANY_CASE = {
+    variant: language
+    for extension, language in _LANGUAGE_MAP.items()
+    for variant in _case_variants(extension)
+}
+
+_DEFAULT_EXCLUDE_DIRS = frozenset(['.git', '__pycache__', 'venv', 'node_modules', 'build', 'dist'])
+
+# Number of directories analyze_directory scans concurrently
+SCAN_WORKERS = 8
 
 def get_file_extension(filename):
     """Extracts the file extension from a filename."""
-    return os.path.splitext(filename)[1].lower()
+    head, dot, ext = filename.rpartition('.')
+    # Leading dots don't start an extension (".bashrc"), as with os.path.splitext
+    if not head.lstrip('.'):
+        return ''
+    return dot + ext.lower()
 
 def infer_language_from_extension(extension):
     """Infers programming language from file extension."""
-    language_map = {
-        ".py": "Python",
-        ".js": "JavaScript",
-        ".ts": "TypeScript",
-        ".java": "Java",
-        ".c": "C",
-        ".cpp": "C++",
-        ".cs": "C#",
-        ".go": "Go",
-        ".rb": "Ruby",
-        ".php": "PHP",
-        ".html": "HTML",
-        ".css": "CSS",
-        ".sh": "Shell Script",
-        ".md": "Markdown",
-        ".json": "JSON",
-        ".yaml": "YAML",
-        ".yml": "YAML",
-        ".xml": "XML",
-        ".sql": "SQL",
-        ".txt": "Text",
-    }
-    return language_map.get(extension, "Unknown")
+    return _LANGUAGE_MAP.get(extension, "Unknown")
 
-def analyze_directory(root_dir, exclude_dirs=None, exclude_files=None):
-    """Analyzes the repository structure and identifies languages."""
-    if exclude_dirs is None:
-        exclude_dirs = ['.git', '__pycache__', 'venv', 'node_modules', 'build', 'dist']
-    if exclude_files is None:
-        exclude_files = []
-
-    language_counts = {}
-    file_counts = {}
-    total_files = 0
-    code_files = []
+def _scan_directory(path, exclude_dirs, exclude_files):
+    """Classifies the entries directly inside one directory.
 
-    for dirpath, dirnames, filenames in os.walk(root_dir):
-        # Apply directory exclusions
-        dirnames[:] = [d for d in dirnames if d not in exclude_dirs]
+    Returns:
+        tuple: (subdirs, language_counts, code_files, total_files), where subdirs are the
+        directories still to be scanned.
+    """
+    subdirs = []
+    language_counts = Counter()
+    code_files = []
+    total_files = 0
 
-        for filename in filenames:
+    try:
+        it = os.scandir(path)
+    except OSError:
+        # Unreadable directories are skipped, as os.walk does
+        return subdirs, language_counts, code_files, total_files
+
+    with it:
+        for entry in it:
+            filename = entry.name
+            if entry.is_dir():
+                # Like os.walk, don't descend into symlinked directories
+                if filename not in exclude_dirs and not entry.is_symlink():
+                    subdirs.append(entry.path)
+                continue
             if filename in exclude_files:
                 continue
 
-            filepath = os.path.join(dirpath, filename)
-            extension = get_file_extension(filename)
-            language = infer_language_from_extension(extension)
+            total_files += 1
+
+            # Inlined get_file_extension/infer_language_from_extension: names without an
+            # extension (Makefile, LICENSE, .bashrc) are rejected without any calls
+            dot = filename.rfind('.')
+            if dot <= 0:
+                continue
+            language = _LANGUAGE_MAP_ANY_CASE.get(filename[dot:])
+            if language is None:
+                continue
+            # Names made of leading dots only ("..py") have no extension either
+            if filename[0] == '.' and not filename[:dot].lstrip('.'):
+                continue
+
+            language_counts[language] += 1
+            code_files.append(entry.path)
 
-            if language != "Unknown":
-                language_counts[language] = language_counts.get(language, 0) + 1
-                code_files.append(filepath)
+    return subdirs, language_counts, code_files, total_files
 
-            file_counts[filename] = file_counts.get(filename, 0) + 1
-            total_files += 1
+def analyze_directory(root_dir, exclude_dirs=None, exclude_files=None):
+    """Analyzes the repository structure and identifies languages.
+
+    Directories are scanned on a thread pool so that their reads overlap.
+    """
+    exclude_dirs = _DEFAULT_EXCLUDE_DIRS if exclude_dirs is None else frozenset(exclude_dirs)
+    exclude_files = frozenset(exclude_files or ())
+
+    language_counts = Counter()
+    total_files = 0
+    code_files = []
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+        pending = {executor.submit(_scan_directory, root_dir, exclude_dirs, exclude_files): root_dir}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                results[path] = future.result()
+                for subdir in results[path][0]:
+                    pending[executor.submit(_scan_directory, subdir, exclude_dirs, exclude_files)] = subdir
+
+    # Merge in top-down tree order rather than completion order, so the results (and the
+    # order of languages with equal counts in the README) are the same on every run
+    stack = [root_dir]
+    while stack:
+        subdirs, dir_language_counts, dir_code_files, dir_total_files = results.pop(stack.pop())
+        language_counts.update(dir_language_counts)
+        code_files.extend(dir_code_files)
+        total_files += dir_total_files
+        stack.extend(reversed(subdirs))
 
     return language_counts, code_files, total_files
 
 def generate_readme(repo_name, description, languages, code_files, total_files):
     """Generates the README.md content."""
-    readme_content = f"# {repo_name}\n\n"
-    readme_content += f"{description}\n\n"
+    # Collect fragments and join once at the end instead of re-copying the string on every +=
+    parts = []
+    append = parts.append
+    append(f"# {repo_name}\n\n")
+    append(f"{description}\n\n")
 
     if languages:
-        readme_content += "## Language Breakdown\n\n"
+        append("## Language Breakdown\n\n")
         for lang, count in sorted(languages.items(), key=lambda item: item[1], reverse=True):
-            readme_content += f"- {lang}: {count}\n"
-        readme_content += "\n"
+            append(f"- {lang}: {count}\n")
+        append("\n")
 
     if code_files:
-        readme_content += "## Project Structure\n\n"
-        readme_content += "### Key Files and Directories:\n\n"
+        append("## Project Structure\n\n")
+        append("### Key Files and Directories:\n\n")
         # Displaying a limited number of files for brevity, can be expanded
         max_files_to_list = 15
-        listed_files = 0
-        for f in sorted(code_files):
-            if listed_files < max_files_to_list:
-                readme_content += f"- `{os.path.relpath(f, '.')}`\n"
-                listed_files += 1
+        # Paths from analyze_directory start with "./" (or the absolute CWD), so they are
+        # made relative by slicing rather than calling os.path.relpath, which runs getcwd()
+        # on every call
+        cur_prefix = os.curdir + os.sep
+        cwd_prefix = os.path.join(os.getcwd(), '')
+        # Only the first few files in sorted order are shown, so don't sort the whole list
+        for f in nsmallest(max_files_to_list, code_files):
+            if f.startswith(cur_prefix):
+                rel = f[len(cur_prefix):]
+            elif f.startswith(cwd_prefix):
+                rel = f[len(cwd_prefix):]
             else:
-                readme_content += f"- ... and {len(code_files) - max_files_to_list} more files.\n"
-                break
-        readme_content += "\n"
-
-    readme_content += "## Getting Started\n\n"
-    readme_content += "To get started with this project:\n\n"
-    readme_content += "1. Clone the repository:\n"
-    readme_content += "   ```bash\n"
-    readme_content += f"   git clone [your-repo-url]\n"
-    readme_content += "   ```\n\n"
-    readme_content += "2. Navigate to the project directory:\n"
-    readme_content += "   ```bash\n"
-    readme_content += "   cd [your-repo-name]\n"
-    readme_content += "   ```\n\n"
-    readme_content += "3. (Optional) Follow specific setup instructions for the project.\n\n"
-
-    readme_content += "## Contributing\n\n"
-    readme_content += "Contributions are welcome! Please refer to the [CONTRIBUTING.md](CONTRIBUTING.md) file (if it exists) for details on how to contribute.\n\n"
-
-    readme_content += "## License\n\n"
-    readme_content += "This project is licensed under the [LICENSE](LICENSE) file (if it exists).\n"
-
-    return readme_content
+                rel = os.path.relpath(f, cwd_prefix)
+            append(f"- `{rel}`\n")
+        if len(code_files) > max_files_to_list:
+            append(f"- ... and {len(code_files) - max_files_to_list} more files.\n")
+        append("\n")
+
+    append("## Getting Started\n\n")
+    append("To get started with this project:\n\n")
+    append("1. Clone the repository:\n")
+    append("   ```bash\n")
+    append("   git clone [your-repo-url]\n")
+    append("   ```\n\n")
+    append("2. Navigate to the project directory:\n")
+    append("   ```bash\n")
+    append("   cd [your-repo-name]\n")
+    append("   ```\n\n")
+    append("3. (Optional) Follow specific setup instructions for the project.\n\n")
+
+    append("## Contributing\n\n")
+    append("Contributions are welcome! Please refer to the [CONTRIBUTING.md](CONTRIBUTING.md) file (if it exists) for details on how to contribute.\n\n")
+
+    append("## License\n\n")
+    append("This project is licensed under the [LICENSE](LICENSE) file (if it exists).\n")
+
+    return ''.join(parts)
 
 def main():
     parser = argparse.ArgumentParser(description="Generate a README.md file for a GitHub repository.")
@@ -1,12 +1,515 @@
-import requests
-from collections import defaultdict
-import matplotlib.pyplot as plt
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+import aiohttp
+from collections import Counter, defaultdict
 import datetime
 
-def analyze_github_activity(username_or_org, is_org=False, num_days=30):
+# Upper bound on simultaneous connections to the GitHub API
+MAX_CONCURRENT_REQUESTS = 10
+# Largest page size the REST API allows, to keep pagination round-trips down
+PER_PAGE = 100
+
+# Format of the UTC timestamps returned by the GitHub API
+ISO_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+# Page size for the repository list and each repository's nested connections
+GRAPHQL_PAGE_SIZE = 100
+# Commit.history takes a GitTimestamp but IssueFilters.since a DateTime, so the window start
+# is passed as two variables of the same value
+_HISTORY_FIELDS = """
+history(since: $since, first: $first, after: $historyCursor) {
+  pageInfo { hasNextPage endCursor }
+  nodes { authoredDate author { user { login } } }
+}
+"""
+_ISSUES_FIELDS = """
+issues(first: $first, after: $issuesCursor, filterBy: {since: $issuesSince}, orderBy: {field: CREATED_AT, direction: DESC}) {
+  pageInfo { hasNextPage endCursor }
+  nodes { createdAt state }
+}
+"""
+_PULLS_FIELDS = """
+pullRequests(first: $first, after: $pullsCursor, orderBy: {field: CREATED_AT, direction: DESC}) {
+  pageInfo { hasNextPage endCursor }
+  nodes { createdAt state mergedAt }
+}
+"""
+# Recent activity for up to 100 repositories of a user or organization in one request
+ACTIVITY_QUERY = """
+query($login: String!, $since: GitTimestamp!, $issuesSince: DateTime!, $first: Int!, $cursor: String,
+      $historyCursor: String, $issuesCursor: String, $pullsCursor: String) {
+  repositoryOwner(login: $login) {
+    repositories(first: $first, after: $cursor, ownerAffiliations: OWNER) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        defaultBranchRef { target { ... on Commit { %s } } }
+        %s
+        %s
+      }
+    }
+  }
+}
+""" % (_HISTORY_FIELDS, _ISSUES_FIELDS, _PULLS_FIELDS)
+# Further pages of one repository's connections, for repositories with more than one page
+HISTORY_QUERY = """
+query($owner: String!, $name: String!, $since: GitTimestamp!, $first: Int!, $historyCursor: String) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef { target { ... on Commit { %s } } }
+  }
+}
+""" % _HISTORY_FIELDS
+ISSUES_QUERY = """
+query($owner: String!, $name: String!, $issuesSince: DateTime!, $first: Int!, $issuesCursor: String) {
+  repository(owner: $owner, name: $name) { %s }
+}
+""" % _ISSUES_FIELDS
+PULLS_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $pullsCursor: String) {
+  repository(owner: $owner, name: $name) { %s }
+}
+""" % _PULLS_FIELDS
+
+# Renders the activity chart in a child process; reads the chart description as JSON on stdin.
+# An explicit Figure draws straight to the Agg rasterizer, without pyplot's global state or
+# an interactive backend.
+VIS_SCRIPT = """
+import json
+import sys
+from matplotlib.figure import Figure
+
+chart = json.load(sys.stdin)
+fig = Figure(figsize=(12, 6))
+ax = fig.subplots()
+ax.bar(chart["dates"], chart["activities"], color='skyblue')
+ax.set_xlabel("Date")
+ax.set_ylabel("Activity Count")
+ax.set_title(chart["title"])
+fig.autofmt_xdate(rotation=45, ha='right')
+fig.tight_layout()
+fig.savefig(chart["output_path"])
+"""
+
+# Conditional-request cache for API responses, keyed on URL and query parameters
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "gh-activity")
+# Cache entries not used for this long are deleted at the start of a run
+CACHE_MAX_AGE = datetime.timedelta(days=7)
+
+def _cache_path(url, params):
+    """Returns the cache file path for a request."""
+    key = json.dumps([url, sorted((params or {}).items())])
+    return os.path.join(CACHE_DIR, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json.gz")
+
+def _load_cached(path):
+    """Loads a cached {"etag", "body", "next"} entry, or None if there isn't a usable one."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, EOFError, ValueError):
+        return None
+
+def _touch_cached(path):
+    """Marks a cache entry as recently used so eviction keeps it."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+def _evict_stale_cache():
+    """Deletes cache entries (and leftover temporary files) older than CACHE_MAX_AGE."""
+    cutoff = time.time() - CACHE_MAX_AGE.total_seconds()
+    try:
+        entries = list(os.scandir(CACHE_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+def _cache_since(start_iso):
+    """Rounds a window start down to midnight UTC for use as a `since` query parameter.
+
+    The parameter is part of the cache key, so an exact start (which moves every run)
+    would never hit the cache; callers apply the exact start themselves.
+    """
+    return start_iso[:10] + "T00:00:00Z"
+
+def _store_cached(path, etag, body, next_url):
+    """Writes a response body, its ETag and its next-page link to the cache."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump({"etag": etag, "body": body, "next": next_url}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: could not write cache file {path}: {e}")
+
+async def _fetch_page(session, url, params=None):
+    """Fetches one page of an API listing.
+
+    A previously seen ETag is sent as If-None-Match; on 304 Not Modified the cached
+    body is returned instead. This saves bandwidth and the download and JSON parsing of
+    unchanged pages, not API quota: the cache is only used on the unauthenticated REST
+    path, where 304 responses still count against the rate limit.
+
+    Returns:
+        tuple: (body, next_url), where next_url is the Link rel="next" target or None.
+    """
+    path = _cache_path(url, params)
+    cached = await asyncio.to_thread(_load_cached, path)
+    headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else None
+
+    async with session.get(url, params=params, headers=headers) as response:
+        if response.status == 304 and cached:
+            await asyncio.to_thread(_touch_cached, path)
+            return cached["body"], cached.get("next")
+        response.raise_for_status()
+        body = await response.json()
+        etag = response.headers.get("ETag")
+        next_link = response.links.get("next")
+        next_url = str(next_link["url"]) if next_link else None
+
+    if etag:
+        await asyncio.to_thread(_store_cached, path, etag, body, next_url)
+    return body, next_url
+
+async def _fetch_pages(session, url, params=None):
+    """Yields every page of an API listing, following Link rel="next"."""
+    while url:
+        body, url = await _fetch_page(session, url, params)
+        # The next link already carries the full query string
+        params = None
+        yield body
+
+async def _analyze_commits(session, repo_url, repo_name, username_or_org, is_org, start_iso, end_iso):
+    """Counts recent commits for a single repository.
+
+    Returns:
+        tuple: (repo_name, totals, repo_counts, activity) counters to be merged into the report.
+    """
+    totals, repo_counts, activity = Counter(), Counter(), Counter()
+    params = {"since": _cache_since(start_iso), "per_page": PER_PAGE}
+    try:
+        async for commits in _fetch_pages(session, f"{repo_url}/commits", params=params):
+            for commit in commits:
+                # The server filtered on the rounded-down start; "since" compares committer dates
+                if commit['commit']['committer']['date'] < start_iso:
+                    continue
+                if commit['author'] and commit['author']['login'] == username_or_org or not is_org: # Basic check, could be improved
+                    totals["total_commits"] += 1
+                    repo_counts["commits"] += 1
+                    commit_date = commit['commit']['author']['date']
+                    if start_iso <= commit_date <= end_iso:
+                        activity[commit_date[:10]] += 1
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error fetching commits for {repo_name}: {e}")
+    return repo_name, totals, repo_counts, activity
+
+async def _analyze_issues(session, repo_url, repo_name, start_iso, end_iso):
+    """Counts issues opened and closed for a single repository.
+
+    Returns:
+        tuple: (repo_name, totals, repo_counts, activity) counters to be merged into the report.
+    """
+    totals, repo_counts, activity = Counter(), Counter(), Counter()
+    # "since" filters on last update, so it only drops issues that can't have been created in the window
+    params = {"state": "all", "since": _cache_since(start_iso), "per_page": PER_PAGE}
+    try:
+        async for issues in _fetch_pages(session, f"{repo_url}/issues", params=params):
+            for issue in issues:
+                # Exclude pull requests from issue count
+                if "pull_request" in issue:
+                    continue
+
+                issue_date = issue['created_at']
+                if start_iso <= issue_date <= end_iso:
+                    if issue['state'] == 'open':
+                        totals["total_issues_opened"] += 1
+                        repo_counts["issues_opened"] += 1
+                        activity[issue_date[:10]] += 1
+                    elif issue['state'] == 'closed':
+                        totals["total_issues_closed"] += 1
+                        repo_counts["issues_closed"] += 1
+                        activity[issue_date[:10]] += 1
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error fetching issues for {repo_name}: {e}")
+    return repo_name, totals, repo_counts, activity
+
+async def _analyze_pulls(session, repo_url, repo_name, start_iso, end_iso):
+    """Counts pull requests opened and merged for a single repository.
+
+    Returns:
+        tuple: (repo_name, totals, repo_counts, activity) counters to be merged into the report.
+    """
+    totals, repo_counts, activity = Counter(), Counter(), Counter()
+    params = {"state": "all", "sort": "created", "direction": "desc", "per_page": PER_PAGE}
+    try:
+        async for pulls in _fetch_pages(session, f"{repo_url}/pulls", params=params):
+            for pull in pulls:
+                pull_date = pull['created_at']
+                if pull_date < start_iso:
+                    # Listed newest first, so every remaining pull request is older too
+                    return repo_name, totals, repo_counts, activity
+                if pull_date <= end_iso:
+                    if pull['state'] == 'open':
+                        totals["total_pull_requests_opened"] += 1
+                        repo_counts["pull_requests_opened"] += 1
+                        activity[pull_date[:10]] += 1
+                    elif pull['state'] == 'closed':
+                        # Check if it was merged
+                        if pull['merged_at']:
+                            totals["total_pull_requests_merged"] += 1
+                            repo_counts["pull_requests_merged"] += 1
+                            activity[pull_date[:10]] += 1
+                        else:
+                            repo_counts["pull_requests_opened"] += 1 # Count closed without merge as opened initially
+                            activity[pull_date[:10]] += 1
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error fetching pull requests for {repo_name}: {e}")
+    return repo_name, totals, repo_counts, activity
+
+def _new_repo_stats():
+    """Returns a zeroed per-repository activity record."""
+    return {
+        "commits": 0,
+        "issues_opened": 0,
+        "issues_closed": 0,
+        "pull_requests_opened": 0,
+        "pull_requests_merged": 0
+    }
+
+def _merge_results(report, results):
+    """Merges per-task counters into the report once every task has finished.
+
+    Failed tasks (exceptions from gather) are reported and skipped, so one broken
+    repository doesn't abort the whole run.
+    """
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"Error analyzing repository activity: {result}")
+            continue
+        repo_name, totals, repo_counts, activity = result
+        for key, count in totals.items():
+            report[key] += count
+        for key, count in repo_counts.items():
+            report["repositories"][repo_name][key] += count
+        for date, count in activity.items():
+            report["activity_over_time"][date] += count
+
+async def _analyze_with_rest(session, report, username_or_org, is_org, start_iso, end_iso):
+    """Fills in the report from the REST API, one set of listings per repository."""
+    api_base_url = "https://api.github.com"
+    await asyncio.to_thread(_evict_stale_cache)
+
+    if is_org:
+        # Get repositories for the organization
+        url = f"{api_base_url}/orgs/{username_or_org}/repos"
+    else:
+        # Get repositories for the user
+        url = f"{api_base_url}/users/{username_or_org}/repos"
+
+    try:
+        repos = [repo async for page in _fetch_pages(session, url, params={"per_page": PER_PAGE}) for repo in page]
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error fetching repositories: {e}")
+        return None
+
+    if not repos:
+        print(f"No repositories found for {username_or_org}.")
+        return report
+
+    tasks = []
+    for repo in repos:
+        repo_name = repo["name"]
+        report["repositories"][repo_name] = _new_repo_stats()
+
+        repo_url = f"{api_base_url}/repos/{username_or_org}/{repo_name}"
+        tasks.append(_analyze_commits(session, repo_url, repo_name, username_or_org, is_org, start_iso, end_iso))
+        tasks.append(_analyze_issues(session, repo_url, repo_name, start_iso, end_iso))
+        tasks.append(_analyze_pulls(session, repo_url, repo_name, start_iso, end_iso))
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    _merge_results(report, results)
+    return report
+
+async def _post_graphql(session, query, variables):
+    """Runs a GraphQL query and returns its data, or None (after printing why) on failure."""
+    try:
+        async with session.post(GRAPHQL_URL, json={"query": query, "variables": variables}) as response:
+            response.raise_for_status()
+            result = await response.json()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error querying the GitHub GraphQL API: {e}")
+        return None
+    if result.get("errors"):
+        print(f"Error querying the GitHub GraphQL API: {result['errors'][0].get('message')}")
+        return None
+    return result.get("data")
+
+def _history_of(repo):
+    """Returns a repository's commit history connection, or None if it has no default branch."""
+    branch = repo and repo.get("defaultBranchRef")
+    return branch["target"].get("history") if branch and branch.get("target") else None
+
+def _count_graphql_commits(totals, repo_counts, activity, commits, username_or_org, is_org, start_iso, end_iso):
+    """Adds a page of GraphQL commit nodes to a repository's counters."""
+    for commit in commits:
+        author = commit["author"]
+        user = author and author["user"]
+        if user and user["login"] == username_or_org or not is_org: # Basic check, could be improved
+            totals["total_commits"] += 1
+            repo_counts["commits"] += 1
+            commit_date = commit["authoredDate"]
+            if start_iso <= commit_date <= end_iso:
+                activity[commit_date[:10]] += 1
+
+def _count_graphql_issues(totals, repo_counts, activity, issues, start_iso, end_iso):
+    """Adds a page of GraphQL issue nodes to a repository's counters.
+
+    Returns:
+        bool: True once an issue older than the window is seen; later pages are older still.
+    """
+    for issue in issues:
+        issue_date = issue["createdAt"]
+        if issue_date < start_iso:
+            return True
+        if issue_date <= end_iso:
+            if issue["state"] == "OPEN":
+                totals["total_issues_opened"] += 1
+                repo_counts["issues_opened"] += 1
+            else:
+                totals["total_issues_closed"] += 1
+                repo_counts["issues_closed"] += 1
+            activity[issue_date[:10]] += 1
+    return False
+
+def _count_graphql_pulls(totals, repo_counts, activity, pulls, start_iso, end_iso):
+    """Adds a page of GraphQL pull request nodes to a repository's counters.
+
+    Returns:
+        bool: True once a pull request older than the window is seen; later pages are older still.
+    """
+    for pull in pulls:
+        pull_date = pull["createdAt"]
+        if pull_date < start_iso:
+            return True
+        if pull_date <= end_iso:
+            if pull["state"] == "OPEN":
+                totals["total_pull_requests_opened"] += 1
+                repo_counts["pull_requests_opened"] += 1
+            elif pull["mergedAt"]:
+                totals["total_pull_requests_merged"] += 1
+                repo_counts["pull_requests_merged"] += 1
+            else:
+                repo_counts["pull_requests_opened"] += 1 # Count closed without merge as opened initially
+            activity[pull_date[:10]] += 1
+    return False
+
+async def _remaining_pages(session, query, variables, cursor_name, connection, get_connection, repo_name):
+    """Yields the node lists of a repository connection's pages after the first one."""
+    while connection and connection["pageInfo"]["hasNextPage"]:
+        data = await _post_graphql(session, query, dict(variables, **{cursor_name: connection["pageInfo"]["endCursor"]}))
+        if data is None:
+            print(f"Warning: activity for {repo_name} may be incomplete.")
+            return
+        connection = get_connection(data["repository"])
+        if connection:
+            yield connection["nodes"]
+
+async def _analyze_graphql_repo(session, repo, username_or_org, is_org, start_iso, end_iso):
+    """Counts one repository from the batched query, paging on through any connection that continues.
+
+    Returns:
+        tuple: (repo_name, totals, repo_counts, activity) counters to be merged into the report.
+    """
+    repo_name = repo["name"]
+    totals, repo_counts, activity = Counter(), Counter(), Counter()
+    counters = (totals, repo_counts, activity)
+    variables = {"owner": username_or_org, "name": repo_name, "first": GRAPHQL_PAGE_SIZE}
+
+    history = _history_of(repo)
+    if history:
+        _count_graphql_commits(*counters, history["nodes"], username_or_org, is_org, start_iso, end_iso)
+        async for commits in _remaining_pages(session, HISTORY_QUERY, dict(variables, since=start_iso), "historyCursor", history, _history_of, repo_name):
+            _count_graphql_commits(*counters, commits, username_or_org, is_org, start_iso, end_iso)
+
+    issues = repo["issues"]
+    if not _count_graphql_issues(*counters, issues["nodes"], start_iso, end_iso):
+        async for page in _remaining_pages(session, ISSUES_QUERY, dict(variables, issuesSince=start_iso), "issuesCursor", issues, lambda r: r and r["issues"], repo_name):
+            if _count_graphql_issues(*counters, page, start_iso, end_iso):
+                break
+
+    pulls = repo["pullRequests"]
+    if not _count_graphql_pulls(*counters, pulls["nodes"], start_iso, end_iso):
+        async for page in _remaining_pages(session, PULLS_QUERY, variables, "pullsCursor", pulls, lambda r: r and r["pullRequests"], repo_name):
+            if _count_graphql_pulls(*counters, page, start_iso, end_iso):
+                break
+
+    return repo_name, totals, repo_counts, activity
+
+async def _analyze_with_graphql(session, report, username_or_org, is_org, start_iso, end_iso):
+    """Fills in the report from the GraphQL API.
+
+    One query returns the first page of activity for 100 repositories; repositories with
+    more commits, issues or pull requests in the window are then paged through individually.
+    """
+    variables = {
+        "login": username_or_org,
+        "since": start_iso,
+        "issuesSince": start_iso,
+        "first": GRAPHQL_PAGE_SIZE,
+        "cursor": None,
+    }
+    found_repos = False
+
+    while True:
+        data = await _post_graphql(session, ACTIVITY_QUERY, variables)
+        if data is None:
+            return None
+
+        owner = data.get("repositoryOwner")
+        if not owner:
+            break
+        repositories = owner["repositories"]
+        if repositories["nodes"]:
+            found_repos = True
+
+        for repo in repositories["nodes"]:
+            report["repositories"][repo["name"]] = _new_repo_stats()
+        results = await asyncio.gather(*[
+            _analyze_graphql_repo(session, repo, username_or_org, is_org, start_iso, end_iso)
+            for repo in repositories["nodes"]
+        ], return_exceptions=True)
+        _merge_results(report, results)
+
+        page_info = repositories["pageInfo"]
+        if not page_info["hasNextPage"]:
+            break
+        variables["cursor"] = page_info["endCursor"]
+
+    if not found_repos:
+        print(f"No repositories found for {username_or_org}.")
+    return report
+
+async def analyze_github_activity(username_or_org, is_org=False, num_days=30):
     """
     Analyzes GitHub repository activity for a given user or organization.
 
+    When the GITHUB_TOKEN environment variable is set, all repositories are read with
+    batched GraphQL queries; otherwise the REST API is used, fetching commits, issues
+    and pull requests for every repository concurrently.
+
     Args:
         username_or_org (str): The GitHub username or organization name.
         is_org (bool): True if analyzing an organization, False for a user.
@@ -28,109 +531,26 @@ def analyze_github_activity(username_or_org, is_org=False, num_days=30):
         "activity_over_time": defaultdict(int)
     }
 
-    api_base_url = "https://api.github.com"
     headers = {
         "Accept": "application/vnd.github.v3+json"
     }
+    # A token selects the GraphQL path, which requires authentication; the REST path
+    # only runs without one, so its requests are always unauthenticated
+    token = os.environ.get("GITHUB_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
 
-    if is_org:
-        # Get repositories for the organization
-        url = f"{api_base_url}/orgs/{username_or_org}/repos"
-    else:
-        # Get repositories for the user
-        url = f"{api_base_url}/users/{username_or_org}/repos"
-
-    try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        repos = response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching repositories: {e}")
-        return None
-
-    if not repos:
-        print(f"No repositories found for {username_or_org}.")
-        return report
-
-    end_date = datetime.datetime.now()
+    end_date = datetime.datetime.now(datetime.timezone.utc)
     start_date = end_date - datetime.timedelta(days=num_days)
+    # GitHub timestamps are fixed-width UTC ("2024-01-31T12:00:00Z"), so the window can be
+    # checked by comparing strings and a day bucket is just the first ten characters
+    start_iso = start_date.strftime(ISO_FORMAT)
+    end_iso = end_date.strftime(ISO_FORMAT)
 
-    for repo in repos:
-        repo_name = repo["name"]
-        report["repositories"][repo_name] = {
-            "commits": 0,
-            "issues_opened": 0,
-            "issues_closed": 0,
-            "pull_requests_opened": 0,
-            "pull_requests_merged": 0
-        }
-
-        # Analyze commits
-        commits_url = f"{api_base_url}/repos/{username_or_org}/{repo_name}/commits"
-        try:
-            commits_response = requests.get(commits_url, headers=headers, params={"since": start_date.isoformat()})
-            commits_response.raise_for_status()
-            commits = commits_response.json()
-            for commit in commits:
-                if commit['author'] and commit['author']['login'] == username_or_org or not is_org: # Basic check, could be improved
-                    report["total_commits"] += 1
-                    report["repositories"][repo_name]["commits"] += 1
-                    commit_date = datetime.datetime.fromisoformat(commit['commit']['author']['date'].replace('Z', '+00:00'))
-                    if start_date <= commit_date <= end_date:
-                        report["activity_over_time"][commit_date.strftime('%Y-%m-%d')] += 1
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching commits for {repo_name}: {e}")
-
-        # Analyze issues
-        issues_url = f"{api_base_url}/repos/{username_or_org}/{repo_name}/issues"
-        try:
-            issues_response = requests.get(issues_url, headers=headers, params={"state": "all"})
-            issues_response.raise_for_status()
-            issues = issues_response.json()
-            for issue in issues:
-                # Exclude pull requests from issue count
-                if "pull_request" in issue:
-                    continue
-
-                issue_date = datetime.datetime.fromisoformat(issue['created_at'].replace('Z', '+00:00'))
-                if start_date <= issue_date <= end_date:
-                    if issue['state'] == 'open':
-                        report["total_issues_opened"] += 1
-                        report["repositories"][repo_name]["issues_opened"] += 1
-                        report["activity_over_time"][issue_date.strftime('%Y-%m-%d')] += 1
-                    elif issue['state'] == 'closed':
-                        report["total_issues_closed"] += 1
-                        report["repositories"][repo_name]["issues_closed"] += 1
-                        report["activity_over_time"][issue_date.strftime('%Y-%m-%d')] += 1
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching issues for {repo_name}: {e}")
-
-        # Analyze pull requests
-        pulls_url = f"{api_base_url}/repos/{username_or_org}/{repo_name}/pulls"
-        try:
-            pulls_response = requests.get(pulls_url, headers=headers, params={"state": "all"})
-            pulls_response.raise_for_status()
-            pulls = pulls_response.json()
-            for pull in pulls:
-                pull_date = datetime.datetime.fromisoformat(pull['created_at'].replace('Z', '+00:00'))
-                if start_date <= pull_date <= end_date:
-                    if pull['state'] == 'open':
-                        report["total_pull_requests_opened"] += 1
-                        report["repositories"][repo_name]["pull_requests_opened"] += 1
-                        report["activity_over_time"][pull_date.strftime('%Y-%m-%d')] += 1
-                    elif pull['state'] == 'closed':
-                        # Check if it was merged
-                        if pull['merged_at']:
-                            report["total_pull_requests_merged"] += 1
-                            report["repositories"][repo_name]["pull_requests_merged"] += 1
-                            report["activity_over_time"][pull_date.strftime('%Y-%m-%d')] += 1
-                        else:
-                            report["repositories"][repo_name]["pull_requests_opened"] += 1 # Count closed without merge as opened initially
-                            report["activity_over_time"][pull_date.strftime('%Y-%m-%d')] += 1
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching pull requests for {repo_name}: {e}")
-
-    return report
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_REQUESTS)
+    async with aiohttp.ClientSession(headers=headers, connector=connector) as session:
+        analyze = _analyze_with_graphql if token else _analyze_with_rest
+        return await analyze(session, report, username_or_org, is_org, start_iso, end_iso)
 
 def print_summary_report(report):
     """Prints a formatted summary report."""
@@ -160,8 +580,12 @@ def print_summary_report(report):
         print("  No repository activity found.")
     print("--------------------------------------")
 
-def visualize_activity(report):
-    """Generates a bar chart for daily activity."""
+def visualize_activity(report, output_path="github_activity.png"):
+    """Renders a bar chart for daily activity and saves it as an image.
+
+    The chart is drawn in a separate Python process, so matplotlib is only imported
+    (and its memory only held) while the chart is being rendered.
+    """
     if not report or not report["activity_over_time"]:
         print("No activity data to visualize.")
         return
@@ -169,14 +593,17 @@ def visualize_activity(report):
     dates = sorted(report["activity_over_time"].keys())
     activities = [report["activity_over_time"][date] for date in dates]
 
-    plt.figure(figsize=(12, 6))
-    plt.bar(dates, activities, color='skyblue')
-    plt.xlabel("Date")
-    plt.ylabel("Activity Count")
-    plt.title(f"Daily GitHub Activity for {report['username_or_org']} (Last {report['num_days']} days)")
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    plt.show()
+    chart = {
+        "dates": dates,
+        "activities": activities,
+        "title": f"Daily GitHub Activity for {report['username_or_org']} (Last {report['num_days']} days)",
+        "output_path": output_path,
+    }
+    result = subprocess.run([sys.executable, "-c", VIS_SCRIPT], input=json.dumps(chart).encode("utf-8"))
+    if result.returncode != 0:
+        print(f"Error rendering activity chart (exit code {result.returncode}).")
+        return
+    print(f"Activity chart saved to '{output_path}'.")
 
 if __name__ == "__main__":
     # --- Configuration ---
@@ -185,7 +612,7 @@ if __name__ == "__main__":
     DAYS_TO_ANALYZE = 30            # Number of past days to analyze
     # ---------------------
 
-    github_report = analyze_github_activity(GITHUB_USER_OR_ORG, is_org=IS_ORGANIZATION, num_days=DAYS_TO_ANALYZE)
+    github_report = asyncio.run(analyze_github_activity(GITHUB_USER_OR_ORG, is_org=IS_ORGANIZATION, num_days=DAYS_TO_ANALYZE))
 
     if github_report:
         print_summary_report(github_report)
@@ -1,50 +1,168 @@
 import asyncio
 import json
+import math
+import re
+import orjson
 from websockets import serve
+from websockets.exceptions import ConnectionClosed
 
-# In-memory storage for whiteboard state and connected clients
+# In-memory storage for whiteboard state and connected clients.
+# Lines are kept as their JSON encoding so a sync only has to join them.
 whiteboard_data = {
     "lines": []
 }
-clients = set()
+# Each connected client has its own outgoing message queue, drained by a writer task
+clients = {}
+# Clients whose queue backs up past this many messages are disconnected
+MAX_QUEUED_MESSAGES = 1000
+# Latest cursor position per client, flushed as one batch every MOUSE_FLUSH_INTERVAL seconds
+pending_moves = {}
+MOUSE_FLUSH_INTERVAL = 1 / 30
+# Strong references to fire-and-forget tasks so they aren't garbage collected early
+background_tasks = set()
+
+
+async def writer(websocket, queue):
+    """Sends queued messages to a single client, in order."""
+    try:
+        while True:
+            message = await queue.get()
+            await websocket.send(message)
+    except ConnectionClosed:
+        # The handler notices the closed connection and cleans up
+        pass
+
+
+def drop_client(websocket):
+    """Disconnects a client that isn't keeping up with broadcasts."""
+    clients.pop(websocket, None)
+    print(f"Dropping slow client: {websocket.remote_address}")
+    task = asyncio.create_task(websocket.close(code=1008, reason="Client is too slow"))
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+
+# orjson reads integers outside the 64-bit range as floats, so messages with numbers this
+# long are left to the stdlib parser, which keeps them exact
+_LONG_DIGITS = re.compile(r"\d{19,}")
+_LONG_DIGITS_BYTES = re.compile(rb"\d{19,}")
+
+
+class NonFiniteFloat(float):
+    """A NaN or infinity read by the stdlib parser.
+
+    orjson refuses to encode float subclasses, so `encode` hands these to the stdlib
+    encoder, which writes them back as NaN/Infinity instead of orjson's null.
+    """
+
+
+def _parse_float(text):
+    """Parses a JSON number, marking ones that overflow to infinity (e.g. 1e400)."""
+    value = float(text)
+    return value if math.isfinite(value) else NonFiniteFloat(value)
+
+
+def decode(message):
+    """Parses a client message with orjson, falling back to the stdlib parser.
+
+    The fallback covers what orjson would reject or change: NaN/Infinity tokens, numbers
+    too large for a float, and integers outside the 64-bit range.
+    """
+    long_digits = _LONG_DIGITS_BYTES if isinstance(message, bytes) else _LONG_DIGITS
+    if not long_digits.search(message):
+        try:
+            return orjson.loads(message)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(message, parse_float=_parse_float, parse_constant=NonFiniteFloat)
+
+
+def encode(message):
+    """Encodes a message as compact JSON."""
+    try:
+        # orjson emits UTF-8 bytes; decode so clients keep receiving text frames
+        return orjson.dumps(message).decode("utf-8")
+    except orjson.JSONEncodeError:
+        # Big integers and NonFiniteFloat values from `decode`
+        return json.dumps(message, separators=(",", ":"))
+
+
+def sync_message():
+    """Builds the sync message carrying every line on the whiteboard."""
+    return '{"action":"sync","lines":[' + ",".join(whiteboard_data["lines"]) + "]}"
 
 
 async def broadcast(message):
     """Sends a message to all connected clients."""
     if clients:
-        message_json = json.dumps(message)
-        # Using gather with return_exceptions=True to ensure one failing client doesn't stop others
-        await asyncio.gather(
-            *[client.send(message_json) for client in clients],
-            return_exceptions=True
-        )
+        await broadcast_encoded(encode(message))
+
+
+async def broadcast_encoded(message_json):
+    """Sends an already JSON-encoded message to all connected clients."""
+    if clients:
+        # Queue the message for each client's writer; a slow client never stalls the others
+        slow_clients = []
+        for client, queue in clients.items():
+            try:
+                queue.put_nowait(message_json)
+            except asyncio.QueueFull:
+                slow_clients.append(client)
+        for client in slow_clients:
+            drop_client(client)
+
+
+async def flush_moves():
+    """Broadcasts the pending cursor positions as a single batch."""
+    global pending_moves
+    if pending_moves:
+        moves, pending_moves = pending_moves, {}
+        await broadcast({"action": "mouse_batch", "moves": moves})
+
+
+async def flusher():
+    """Periodically flushes coalesced mouse_move updates."""
+    while True:
+        await asyncio.sleep(MOUSE_FLUSH_INTERVAL)
+        await flush_moves()
 
 
 async def handle_message(websocket, message):
     """Handles incoming messages from clients."""
     try:
-        data = json.loads(message)
+        data = decode(message)
         action = data.get("action")
 
         if action == "draw":
             line = data.get("line")
             if line:
-                whiteboard_data["lines"].append(line)
-                await broadcast({"action": "draw", "line": line})
+                line_json = encode(line)
+                whiteboard_data["lines"].append(line_json)
+                await broadcast_encoded('{"action":"draw","line":' + line_json + "}")
         elif action == "clear":
             whiteboard_data["lines"] = []
             await broadcast({"action": "clear"})
         elif action == "sync":
-            await websocket.send(json.dumps({"action": "sync", "lines": whiteboard_data["lines"]}))
+            # Sent through the client's queue so it stays ordered with broadcasts
+            queue = clients.get(websocket)
+            if queue is not None:
+                try:
+                    queue.put_nowait(sync_message())
+                except asyncio.QueueFull:
+                    drop_client(websocket)
         elif action == "undo":
             if whiteboard_data["lines"]:
-                last_line = whiteboard_data["lines"].pop()
-                await broadcast({"action": "undo", "removed_line": last_line})
+                last_line_json = whiteboard_data["lines"].pop()
+                await broadcast_encoded('{"action":"undo","removed_line":' + last_line_json + "}")
         elif action == "mouse_move":
-            await broadcast({"action": "mouse_move", "coords": data.get("coords"), "client_id": str(websocket.remote_address)})
+            # Coalesced; only the latest position per client is sent by the flusher
+            pending_moves[str(websocket.remote_address)] = data.get("coords")
         elif action == "mouse_up":
+            # Send any pending moves first so they don't arrive after the button event
+            await flush_moves()
             await broadcast({"action": "mouse_up", "client_id": str(websocket.remote_address)})
         elif action == "mouse_down":
+            await flush_moves()
             await broadcast({"action": "mouse_down", "coords": data.get("coords"), "client_id": str(websocket.remote_address)})
 
     except json.JSONDecodeError:
@@ -55,27 +173,33 @@ async def handle_message(websocket, message):
 
 async def handler(websocket):
     """Handles a new WebSocket connection."""
-    clients.add(websocket)
+    queue = asyncio.Queue(maxsize=MAX_QUEUED_MESSAGES)
+    # Immediately send the current whiteboard state to the new client
+    queue.put_nowait(sync_message())
+    clients[websocket] = queue
+    writer_task = asyncio.create_task(writer(websocket, queue))
     print(f"Client connected: {websocket.remote_address}")
 
     try:
-        # Immediately send the current whiteboard state to the new client
-        await websocket.send(json.dumps({"action": "sync", "lines": whiteboard_data["lines"]}))
-
         async for message in websocket:
             await handle_message(websocket, message)
     except Exception as e:
         print(f"Connection error with {websocket.remote_address}: {e}")
     finally:
-        clients.remove(websocket)
+        writer_task.cancel()
+        clients.pop(websocket, None)
         print(f"Client disconnected: {websocket.remote_address}")
 
 
 async def main():
     """Starts the WebSocket server."""
     print("Starting WebSocket server on ws://localhost:8765")
-    async with serve(handler, "localhost", 8765):
-        await asyncio.Future()  # Run forever
+    flusher_task = asyncio.create_task(flusher())
+    try:
+        async with serve(handler, "localhost", 8765):
+            await asyncio.Future()  # Run forever
+    finally:
+        flusher_task.cancel()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-import random
+import secrets
 import string
 
 def generate_password(length=12, character_sets=None):
@@ -10,7 +10,10 @@ def generate_password(length=12, character_sets=None):
                        If None, uses lowercase letters, uppercase letters, digits, and punctuation.
 
     Returns:
-        A string representing the generated password.
+        A string representing the generated password, drawn from the `secrets` CSPRNG.
+
+    Raises:
+        ValueError: If character_sets is empty.
     """
 
     if character_sets is None:
@@ -19,7 +22,21 @@ def generate_password(length=12, character_sets=None):
     if length <= 0:
         return ""
 
-    password = ''.join(random.choice(character_sets) for _ in range(length))
+    num_chars = len(character_sets)
+    if num_chars == 0:
+        raise ValueError("character_sets must not be empty")
+    if num_chars > 256:
+        return ''.join(secrets.choice(character_sets) for _ in range(length))
+
+    # Draw random bytes in batches and map them onto the character set. Bytes at or
+    # above `limit` are rejected so that every character is equally likely.
+    limit = 256 - 256 % num_chars
+    chars = []
+    while len(chars) < length:
+        needed = length - len(chars)
+        chars.extend(character_sets[b % num_chars] for b in secrets.token_bytes(needed * 2) if b < limit)
+
+    password = ''.join(chars[:length])
     return password
 
 if __name__ == "__main__":